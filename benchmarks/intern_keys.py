@@ -0,0 +1,61 @@
+"""
+    Memory used by validated records with and without intern_keys.
+    Records are parsed one by one, so every record has its own key strings (as with NDJSON).
+
+    PYTHONPATH=. python benchmarks/intern_keys.py [records]
+"""
+import json
+import sys
+import tracemalloc
+
+from schema_checker import validate
+
+SCHEMA = {
+    'type': dict,
+    'value': {
+        'id': int,
+        'address': {
+            'type': dict,
+            'any_key': str,
+        },
+        'country': {
+            'type': str,
+            'default': 'unknown',
+        },
+    },
+    'unexpected': True,
+}
+
+
+def make_line(i: int) -> str:
+    return json.dumps(
+        {
+            'id': i,
+            'address': {'street_name': 'Main street', 'building_number': str(i), 'postal_code': '12345'},
+            'created_at_timestamp': i,
+            'updated_at_timestamp': i,
+        }
+    )
+
+
+def measure(lines, **kwargs) -> int:
+    tracemalloc.start()
+    records = [validate(json.loads(line), SCHEMA, **kwargs) for line in lines]
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    assert len(records) == len(lines)
+    return size
+
+
+def main() -> None:
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    lines = [make_line(i) for i in range(count)]
+    plain = measure(lines)
+    interned = measure(lines, intern_keys=True)
+    print('records:           {}'.format(count))
+    print('plain:             {:.1f} MiB'.format(plain / 2 ** 20))
+    print('intern_keys=True:  {:.1f} MiB ({:.0%} less)'.format(interned / 2 ** 20, 1 - interned / plain))
+
+
+if __name__ == '__main__':
+    main()
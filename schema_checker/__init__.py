@@ -1,9 +1,19 @@
-
-from .jschema import validate
+from .jschema import validate, set_check_order, reset_check_stats
 from .extras import kw_validator, decorator_constructor
+from .coerce import register_coercion
+from .exceptions import CoerceError, LimitExceeded
+from .lazy import validate_lazy
+from .registry import SchemaRegistry
 
 __all__ = [
+    'CoerceError',
     'decorator_constructor',
     'kw_validator',
+    'LimitExceeded',
+    'register_coercion',
+    'reset_check_stats',
+    'SchemaRegistry',
+    'set_check_order',
     'validate',
+    'validate_lazy',
 ]
@@ -0,0 +1,174 @@
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+import argparse
+import importlib
+import json
+import mmap
+import multiprocessing
+import os
+import sys
+
+from .jschema import validate
+
+# (path, start offset, end offset)
+Shard = Tuple[str, int, int]
+
+# how many shards per worker - smaller shards balance load between workers better
+SHARDS_PER_WORKER = 4
+
+_schema = None  # type: Any
+
+
+def load_schema(ref: str) -> Any:
+    """
+        ref - "package.module:NAME" (NAME may be dotted: "module:Class.schema")
+        raises ValueError if schema can't be loaded
+    """
+    module_name, sep, name = ref.partition(':')
+    if not sep or not module_name or not name:
+        raise ValueError('schema must be "module:NAME", got "{}"'.format(ref))
+    try:
+        obj = importlib.import_module(module_name)
+        for attr in name.split('.'):
+            obj = getattr(obj, attr)
+    except (ImportError, AttributeError) as ex:
+        raise ValueError('can not load schema "{}": {}'.format(ref, ex)) from None
+    return obj
+
+
+def split_shards(path: str, count: int) -> List[Shard]:
+    """
+        split file into (at most) count shards; every shard begins at line start
+    """
+    size = os.path.getsize(path)
+    if not size:
+        return []
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        bounds = [0]
+        for i in range(1, count):
+            pos = max(size * i // count, bounds[-1])
+            nl = mm.find(b'\n', pos)
+            if nl == -1:
+                break
+            if nl + 1 > bounds[-1]:
+                bounds.append(nl + 1)
+        if bounds[-1] < size:
+            bounds.append(size)
+    return [(path, start, end) for start, end in zip(bounds, bounds[1:])]
+
+
+def _init_worker(schema_ref: str) -> None:
+    global _schema
+    _schema = load_schema(schema_ref)
+
+
+def validate_shard(shard: Shard, max_errors: int) -> Dict[str, Any]:
+    """
+        validate every non-empty line of shard as json object
+        returns report: records, invalid, first max_errors errors and offsets of all bad lines
+    """
+    path, start, end = shard
+    report = {
+        'records': 0,
+        'invalid': 0,
+        'errors': [],
+        'bad_offsets': [],
+    }  # type: Dict[str, Any]
+    with open(path, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+        pos = start
+        while pos < end:
+            nl = mm.find(b'\n', pos, end)
+            if nl == -1:
+                nl = end
+            line = mm[pos:nl]
+            if line.strip():
+                report['records'] += 1
+                try:
+                    validate(json.loads(line.decode('utf-8')), _schema)
+                except Exception as ex:
+                    # any failure (bad json, too deep nesting, broken schema) marks only this line as invalid
+                    report['invalid'] += 1
+                    report['bad_offsets'].append(pos)
+                    if len(report['errors']) < max_errors:
+                        report['errors'].append({'offset': pos, 'error': '{}: {}'.format(type(ex).__name__, ex)})
+            pos = nl + 1
+    return report
+
+
+def _validate_shard_args(args: Tuple[Shard, int]) -> Dict[str, Any]:
+    return validate_shard(*args)
+
+
+def validate_files(
+    paths: Sequence[str],
+    schema_ref: str,
+    workers: int = 1,
+    max_errors: int = 10,
+) -> Dict[str, Dict[str, Any]]:
+    """
+        returns report for each file: records, valid, invalid,
+        first max_errors errors of the file (offset and message) and byte offsets of all bad lines
+    """
+    # fail here on bad reference: pool would restart workers dying in _init_worker forever
+    _init_worker(schema_ref)
+    shards_count = workers * SHARDS_PER_WORKER if workers > 1 else 1
+    shards = [shard for path in paths for shard in split_shards(path, shards_count)]
+    tasks = [(shard, max_errors) for shard in shards]
+    if workers > 1:
+        with multiprocessing.Pool(workers, initializer=_init_worker, initargs=(schema_ref,)) as pool:
+            results = pool.map(_validate_shard_args, tasks, chunksize=1)
+    else:
+        results = [_validate_shard_args(task) for task in tasks]
+
+    report = {
+        path: {
+            'records': 0,
+            'valid': 0,
+            'invalid': 0,
+            'errors': [],
+            'bad_offsets': [],
+        }
+        for path in paths
+    }  # type: Dict[str, Dict[str, Any]]
+    # shards are in file order, so first errors of file are first errors of its shards
+    for (path, _, _), result in zip(shards, results):
+        file_report = report[path]
+        file_report['records'] += result['records']
+        file_report['invalid'] += result['invalid']
+        file_report['valid'] = file_report['records'] - file_report['invalid']
+        file_report['errors'].extend(result['errors'][:max_errors - len(file_report['errors'])])
+        file_report['bad_offsets'].extend(result['bad_offsets'])
+    return report
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog='python -m schema_checker')
+    commands = parser.add_subparsers(dest='command')
+    command = commands.add_parser('validate', help='validate NDJSON files (one json object per line)')
+    command.add_argument('--schema', required=True, help='schema as "module:NAME"')
+    command.add_argument('--workers', type=int, default=os.cpu_count() or 1, help='number of worker processes')
+    command.add_argument('--max-errors', type=int, default=10, help='how many error messages to keep per file')
+    command.add_argument('--output', help='file for json report (default: stdout)')
+    command.add_argument('files', nargs='+')
+    args = parser.parse_args(argv)
+    if args.command != 'validate':
+        parser.print_help()
+        return 2
+
+    try:
+        report = validate_files(
+            paths=args.files,
+            schema_ref=args.schema,
+            workers=max(args.workers, 1),
+            max_errors=args.max_errors,
+        )
+    except ValueError as ex:
+        # only load_schema() raises ValueError, bad lines are in report
+        sys.stderr.write('{}\n'.format(ex))
+        return 2
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+    else:
+        json.dump(report, sys.stdout, indent=2)
+        sys.stdout.write('\n')
+    return 1 if any(i['invalid'] for i in report.values()) else 0
@@ -0,0 +1,125 @@
+from typing import Any, Callable, Dict, Tuple, Type
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+import re
+
+_TRUE = frozenset(['true', '1', 'yes', 'on', 't', 'y'])
+_FALSE = frozenset(['false', '0', 'no', 'off', 'f', 'n'])
+_ISO_DATETIME_RE = re.compile(
+    r'(\d{4})-(\d{2})-(\d{2})'
+    r'(?:[T ](\d{2}):(\d{2})(?::(\d{2})(?:[.,](\d{1,6})\d*)?)?)?'
+    r'(Z|[+-]\d{2}:?\d{2})?'
+)
+
+
+def to_int(value: Any) -> int:
+    if isinstance(value, int) and not isinstance(value, bool):
+        return value
+    if isinstance(value, (str, bytes)):
+        return int(value)
+    raise TypeError(value)
+
+
+def to_float(value: Any) -> float:
+    if isinstance(value, float):
+        return value
+    if isinstance(value, (str, bytes, int)) and not isinstance(value, bool):
+        return float(value)
+    raise TypeError(value)
+
+
+def to_decimal(value: Any) -> Decimal:
+    if isinstance(value, Decimal):
+        return value
+    if isinstance(value, float):
+        # str() gives shortest repr, so 0.1 -> Decimal('0.1')
+        value = str(value)
+    elif isinstance(value, bool) or not isinstance(value, (str, int)):
+        raise TypeError(value)
+    result = Decimal(value)
+    if not result.is_finite():
+        raise ValueError(value)
+    return result
+
+
+def to_bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, int) and value in {0, 1}:
+        return bool(value)
+    if isinstance(value, str):
+        value = value.strip().lower()
+        if value in _TRUE:
+            return True
+        if value in _FALSE:
+            return False
+    raise ValueError(value)
+
+
+def to_datetime(value: Any) -> datetime:
+    """
+        ISO-8601: YYYY-MM-DD[(T| )HH:MM[:SS[.ffffff]]][Z|+HH:MM|+HHMM]
+    """
+    if isinstance(value, datetime):
+        return value
+    if not isinstance(value, str):
+        raise TypeError(value)
+    match = _ISO_DATETIME_RE.fullmatch(value.strip())
+    if match is None:
+        raise ValueError(value)
+    year, month, day, hour, minute, second, fraction, tz = match.groups()
+    tzinfo = None
+    if tz == 'Z':
+        tzinfo = timezone.utc
+    elif tz:
+        offset = timedelta(hours=int(tz[1:3]), minutes=int(tz[-2:]))
+        tzinfo = timezone(-offset if tz[0] == '-' else offset)
+    return datetime(
+        int(year),
+        int(month),
+        int(day),
+        int(hour or 0),
+        int(minute or 0),
+        int(second or 0),
+        int((fraction or '0').ljust(6, '0')),
+        tzinfo=tzinfo,
+    )
+
+
+def to_timestamp(value: Any) -> datetime:
+    """
+        epoch seconds (int/float/numeric str) -> aware datetime in UTC
+    """
+    if isinstance(value, datetime):
+        return value
+    if isinstance(value, bool):
+        raise TypeError(value)
+    if isinstance(value, str):
+        value = float(value)
+    return datetime.fromtimestamp(value, tz=timezone.utc)
+
+
+# name -> (converter, type of result)
+# result type lets validator skip type check right after successful conversion
+COERCIONS = {
+    'int': (to_int, int),
+    'float': (to_float, float),
+    'decimal': (to_decimal, Decimal),
+    'bool': (to_bool, bool),
+    'datetime': (to_datetime, datetime),
+    'timestamp': (to_timestamp, datetime),
+}  # type: Dict[str, Tuple[Callable[[Any], Any], Type]]
+
+
+def register_coercion(name: str, func: Callable[[Any], Any], result_type: Type) -> None:
+    """
+        func - Callable[value -> value], must raise ValueError/TypeError/ArithmeticError on bad value
+        result_type - type of every value returned by func
+    """
+    COERCIONS[name] = (func, result_type)
+
+
+def get_coercion(name: str) -> Tuple[Callable[[Any], Any], Type]:
+    if name not in COERCIONS:
+        raise ValueError('unknown coercion "{}"'.format(name))
+    return COERCIONS[name]
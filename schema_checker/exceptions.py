@@ -0,0 +1,27 @@
+from typing import Any
+
+
+class CoerceError(ValueError):
+    """
+        raised if value can't be converted by "coerce" step
+        value - source value
+        coerce - name of coercion
+    """
+
+    def __init__(self, value: Any, coerce: str, extra: str = '') -> None:
+        super().__init__('can not coerce "{}" to {} {}'.format(value, coerce, extra).rstrip())
+        self.value = value
+        self.coerce = coerce
+
+
+class LimitExceeded(ValueError):
+    """
+        raised if validation exceeded one of resource limits; never replaced by "errmsg"
+        limit - name of limit: "max_depth", "max_items", "max_nodes" or "deadline"
+        value - value of this limit
+    """
+
+    def __init__(self, limit: str, value: Any, extra: str = '') -> None:
+        super().__init__('limit "{}" ({}) exceeded {}'.format(limit, value, extra).rstrip())
+        self.limit = limit
+        self.value = value
@@ -0,0 +1,167 @@
+from typing import Any, Callable, Dict, FrozenSet, Iterable, Pattern, Tuple, Union
+from datetime import datetime
+import functools
+import ipaddress
+import re
+import string
+
+_EMAIL_RE = re.compile(r'[^@\s]+@[^@\s.]+(\.[^@\s.]+)+')
+_UUID_RE = re.compile(r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}')
+_ISO_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+
+def _is_email(value: str) -> bool:
+    return '@' in value and len(value) <= 254 and _EMAIL_RE.fullmatch(value) is not None
+
+
+def _is_uuid(value: str) -> bool:
+    return len(value) == 36 and _UUID_RE.fullmatch(value) is not None
+
+
+def _is_iso_date(value: str) -> bool:
+    if len(value) != 10 or _ISO_DATE_RE.fullmatch(value) is None:
+        return False
+    try:
+        datetime.strptime(value, '%Y-%m-%d')
+    except ValueError:
+        return False
+    return True
+
+
+def _is_ip(factory: Callable, max_length: int, value: str) -> bool:
+    if len(value) > max_length:
+        return False
+    try:
+        factory(value)
+    except ValueError:
+        return False
+    return True
+
+
+# name -> Callable[str -> bool]
+FORMATS = {
+    'email': _is_email,
+    'uuid': _is_uuid,
+    'iso-date': _is_iso_date,
+    'ipv4': functools.partial(_is_ip, ipaddress.IPv4Address, 15),
+    'ipv6': functools.partial(_is_ip, ipaddress.IPv6Address, 45),
+}  # type: Dict[str, Callable[[str], bool]]
+
+# name -> allowed chars ("ascii" is checked separately as the cheapest one)
+CHARSETS = {
+    'digits': string.digits,
+    'hexdigits': string.hexdigits,
+    'letters': string.ascii_letters,
+    'alnum': string.ascii_letters + string.digits,
+    'printable': string.printable,
+}  # type: Dict[str, str]
+
+
+@functools.lru_cache(maxsize=None)
+def compile_pattern(pattern: Union[str, bytes]) -> Pattern:
+    return re.compile(pattern)
+
+
+# id(set/list charset) -> (charset, compiled for str, compiled for bytes); keeps charset alive so id is not reused
+_unhashable_charsets = {}  # type: Dict[int, Tuple[Any, FrozenSet, FrozenSet]]
+_UNHASHABLE_CHARSETS_SIZE = 1024
+
+
+def _char_codes(chars: Iterable[Any]) -> FrozenSet:
+    # bytes are iterated as ints, so chars of charset must be ints too
+    return frozenset(ord(i) if isinstance(i, str) else i for i in chars)
+
+
+def _chars(chars: Iterable[Any]) -> FrozenSet:
+    # charset given as bytes is iterated as ints
+    return frozenset(chr(i) if isinstance(i, int) else i for i in chars)
+
+
+def _make_charset(charset: Any, for_bytes: bool) -> FrozenSet:
+    if isinstance(charset, str):
+        if charset not in CHARSETS:
+            raise ValueError('unknown charset "{}"'.format(charset))
+        charset = CHARSETS[charset]
+    return _char_codes(charset) if for_bytes else _chars(charset)
+
+
+@functools.lru_cache(maxsize=None)
+def _compile_charset(charset: Any, for_bytes: bool) -> FrozenSet:
+    return _make_charset(charset, for_bytes)
+
+
+def _compile_unhashable_charset(charset: Any, for_bytes: bool) -> FrozenSet:
+    cached = _unhashable_charsets.get(id(charset))
+    if cached is None:
+        if len(_unhashable_charsets) >= _UNHASHABLE_CHARSETS_SIZE:
+            _unhashable_charsets.clear()
+        cached = _unhashable_charsets[id(charset)] = (
+            charset,
+            _make_charset(charset, False),
+            _make_charset(charset, True),
+        )
+    return cached[2 if for_bytes else 1]
+
+
+_TEXT = (str, bytes, bytearray)
+
+
+def _check_text(value: Any, check: str) -> None:
+    if not isinstance(value, _TEXT):
+        raise ValueError('"{}" can only be used for str or bytes value, got {}'.format(check, type(value).__name__))
+
+
+def is_ascii(value: Union[str, bytes]) -> bool:
+    if isinstance(value, (bytes, bytearray)):
+        return all(i < 128 for i in value)
+    try:
+        value.encode('ascii')
+    except UnicodeEncodeError:
+        return False
+    return True
+
+
+def check_charset(value: Union[str, bytes], charset: Any) -> bool:
+    """
+        charset - name of predefined charset ("ascii" or one of CHARSETS)
+                  or set/frozenset/tuple/bytes of allowed chars; works for both str and bytes values
+    """
+    _check_text(value, 'charset')
+    if charset == 'ascii':
+        return is_ascii(value)
+    for_bytes = isinstance(value, (bytes, bytearray))
+    if isinstance(charset, (set, list)):
+        return _compile_unhashable_charset(charset, for_bytes).issuperset(value)
+    return _compile_charset(charset, for_bytes).issuperset(value)
+
+
+def check_format(value: Union[str, bytes], name: str) -> bool:
+    if name not in FORMATS:
+        raise ValueError('unknown format "{}"'.format(name))
+    _check_text(value, 'format')
+    if not isinstance(value, str):
+        # all formats are ascii only
+        try:
+            value = value.decode('ascii')
+        except UnicodeDecodeError:
+            return False
+    return FORMATS[name](value)
+
+
+def check_pattern(value: Union[str, bytes], pattern: Union[str, bytes, Pattern]) -> bool:
+    _check_text(value, 'pattern')
+    if isinstance(pattern, (str, bytes)):
+        pattern = compile_pattern(pattern)
+    if isinstance(pattern.pattern, str) != isinstance(value, str):
+        raise ValueError(
+            'pattern of type {} can not be used for value of type {}'.format(
+                type(pattern.pattern).__name__,
+                type(value).__name__,
+            )
+        )
+    return pattern.fullmatch(value) is not None
+
+
+def byte_length(value: Union[str, bytes]) -> int:
+    _check_text(value, 'max_bytes/min_bytes')
+    return len(value) if isinstance(value, (bytes, bytearray)) else len(value.encode('utf-8'))
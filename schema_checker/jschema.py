@@ -1,5 +1,12 @@
 
-from typing import Any, Dict, NoReturn, TypeVar, Union, Type, Tuple, Callable, Iterable
+from typing import Any, Dict, NoReturn, TypeVar, Union, Type, Tuple, Callable, Iterable, Optional
+from collections import OrderedDict
+import sys
+import time
+
+from .coerce import get_coercion
+from .exceptions import CoerceError, LimitExceeded
+from .formats import byte_length, check_charset, check_format, check_pattern
 
 ObjType = TypeVar('ObjType')
 SchemaType = Union[str, Type, Tuple[Type], Dict[Union[str, Type], Any]]
@@ -10,12 +17,78 @@ def _get_type(sch: Dict[Union[str, Type], Any]) -> Any:
 
 
 def _default(value: Any) -> Any:
+    # non-callable default is the same object in all results, it is never copied
     return value() if callable(value) else value
 
 
+def _intern(key: Any) -> Any:
+    return sys.intern(key) if type(key) is str else key
+
+
+class _Context:
+    """
+        state of one validate() call: resource limits, counters and output options
+    """
+
+    __slots__ = ('max_depth', 'max_items', 'max_nodes', 'deadline', 'expires', 'depth', 'nodes', 'intern_keys')
+
+    def __init__(
+        self,
+        max_depth: Optional[int] = None,
+        max_items: Optional[int] = None,
+        max_nodes: Optional[int] = None,
+        deadline: Optional[float] = None,
+        intern_keys: bool = False,
+    ) -> None:
+        self.max_depth = max_depth
+        self.max_items = max_items
+        self.max_nodes = max_nodes
+        self.deadline = deadline
+        self.expires = None if deadline is None else time.monotonic() + deadline
+        self.depth = 0
+        self.nodes = 0
+        self.intern_keys = intern_keys
+
+    def check_items(self, obj: ObjType, extra: str) -> None:
+        if self.max_items is not None and isinstance(obj, _CONTAINERS) and len(obj) > self.max_items:
+            raise LimitExceeded('max_items', self.max_items, extra)
+
+    def count(self, nodes: int, extra: str) -> None:
+        self.nodes += nodes
+        if self.max_nodes is not None and self.nodes > self.max_nodes:
+            raise LimitExceeded('max_nodes', self.max_nodes, extra)
+        if self.expires is not None and time.monotonic() > self.expires:
+            raise LimitExceeded('deadline', self.deadline, extra)
+
+    def enter(self, obj: ObjType, extra: str) -> None:
+        """
+            called for every node before pre_call
+        """
+        self.count(1, extra)
+        self.check_items(obj, extra)
+
+    def descend(self, obj: ObjType, extra: str) -> None:
+        """
+            called before validation of container's items
+        """
+        self.depth += 1
+        if self.max_depth is not None and self.depth > self.max_depth:
+            raise LimitExceeded('max_depth', self.max_depth, extra)
+        # pre_call could make new container
+        self.check_items(obj, extra)
+
+
+_CONTAINERS = (list, tuple, dict, set, frozenset)
+
+
 def _on_error(schema: SchemaType, msg: Union[str, Exception]) -> NoReturn:
+    if isinstance(msg, LimitExceeded):
+        raise msg
     if isinstance(schema, dict):
         msg = schema.get('errmsg', msg)
+    if isinstance(msg, ValueError):
+        # keep subclasses like CoerceError for caller
+        raise msg
     raise ValueError(msg)
 
 
@@ -47,15 +120,23 @@ def _check_dict_key(obj: ObjType, schema: Dict[str, Any], extra: str) -> ObjType
     }
 
 
-def _validate_dicts_value(obj: ObjType, schema: Dict[str, Any], extra: str) -> ObjType:
+def _validate_dicts_value(
+    obj: ObjType,
+    schema: Dict[str, Any],
+    extra: str,
+    ctx: Optional[_Context] = None,
+) -> ObjType:
     new_obj = _check_dict_key(obj=obj, schema=schema, extra=extra)
+    # keys from schema['value'] are taken from schema itself, so only unexpected ones need interning
+    if new_obj and ctx is not None and ctx.intern_keys:
+        new_obj = {_intern(i): new_obj[i] for i in new_obj}
     try:
         new_obj.update(
             {
                 i: (
                     _default(schema['value'][i]['default'])
                     if i not in obj else
-                    _apply(obj=obj[i], schema=schema['value'][i], key=i)
+                    _apply(obj=obj[i], schema=schema['value'][i], key=i, ctx=ctx)
                 )
                 for i in schema['value']
             }
@@ -65,12 +146,15 @@ def _validate_dicts_value(obj: ObjType, schema: Dict[str, Any], extra: str) -> O
     return new_obj
 
 
-def _validate_dict(obj: ObjType, schema: Dict[str, Any], extra: str) -> ObjType:
+def _validate_dict(obj: ObjType, schema: Dict[str, Any], extra: str, ctx: Optional[_Context] = None) -> ObjType:
     if 'value' in schema:
-        obj = _validate_dicts_value(obj=obj, schema=schema, extra=extra)
+        obj = _validate_dicts_value(obj=obj, schema=schema, extra=extra, ctx=ctx)
     elif 'any_key' in schema:
         try:
-            obj = {i: _apply(obj[i], schema['any_key'], i) for i in obj}
+            if ctx is not None and ctx.intern_keys:
+                obj = {_intern(i): _apply(obj[i], schema['any_key'], i, ctx) for i in obj}
+            else:
+                obj = {i: _apply(obj[i], schema['any_key'], i, ctx) for i in obj}
         except ValueError as ex:
             _on_error(schema, ex)
     return obj
@@ -80,37 +164,287 @@ def _check_filter(obj: ObjType, func: Union[Callable, Iterable[Callable]]) -> bo
     return all(func(obj) for func in ([func] if callable(func) else func))
 
 
-def _generic_checks(obj: ObjType, schema: SchemaType, schema_type: Type, extra: str, key: str) -> ObjType:
-    if not isinstance(obj, schema_type):
-        _on_error(schema, 'expected type "{}" {} ; got {}'.format(schema_type, extra, type(obj)))
-    if 'filter' in schema and not _check_filter(obj, schema['filter']):
+def _check_filters(obj: ObjType, schema: Dict[str, Any], key: str) -> None:
+    # filters may guard each other (len(s) > 0 before s[0]), so they always run together in declared order
+    if not _check_filter(obj, schema['filter']):
         _on_error(schema, '"{}" not passed filter'.format(key))
-    if schema.get('blank') is False and not obj:
+
+
+def _check_blank(obj: ObjType, schema: Dict[str, Any], key: str) -> None:
+    if schema['blank'] is False and not obj:
         _on_error(schema, '"{}" is blank'.format(key))
-    if 'max_length' in schema and len(obj) > schema['max_length']:
+
+
+def _check_max_length(obj: ObjType, schema: Dict[str, Any], key: str) -> None:
+    if len(obj) > schema['max_length']:
         _on_error(schema, '"{}" > max_length'.format(key))
-    if 'min_length' in schema and len(obj) < schema['min_length']:
+
+
+def _check_min_length(obj: ObjType, schema: Dict[str, Any], key: str) -> None:
+    if len(obj) < schema['min_length']:
         _on_error(schema, '"{}" < min_length'.format(key))
+
+
+def _check_bytes(obj: ObjType, schema: Dict[str, Any], key: str) -> None:
+    size = byte_length(obj)
+    if 'max_bytes' in schema and size > schema['max_bytes']:
+        _on_error(schema, '"{}" > max_bytes'.format(key))
+    if 'min_bytes' in schema and size < schema['min_bytes']:
+        _on_error(schema, '"{}" < min_bytes'.format(key))
+
+
+def _check_charset(obj: ObjType, schema: Dict[str, Any], key: str) -> None:
+    if not check_charset(obj, schema['charset']):
+        _on_error(schema, '"{}" has chars out of charset'.format(key))
+
+
+def _check_format(obj: ObjType, schema: Dict[str, Any], key: str) -> None:
+    if not check_format(obj, schema['format']):
+        _on_error(schema, '"{}" is not valid {}'.format(key, schema['format']))
+
+
+def _check_pattern(obj: ObjType, schema: Dict[str, Any], key: str) -> None:
+    if not check_pattern(obj, schema['pattern']):
+        _on_error(schema, '"{}" does not match pattern'.format(key))
+
+
+# (schema keys, check) - cheapest checks go first, regex - last
+_STRING_CHECKS = (
+    (frozenset(['max_bytes', 'min_bytes']), _check_bytes),
+    (frozenset(['charset']), _check_charset),
+    (frozenset(['format']), _check_format),
+    (frozenset(['pattern']), _check_pattern),
+)
+_STRING_KEYS = frozenset(['max_bytes', 'min_bytes', 'charset', 'format', 'pattern'])
+
+# all checks after type check that don't depend on each other
+_INDEPENDENT_CHECKS = (
+    (frozenset(['filter']), _check_filters),
+    (frozenset(['blank']), _check_blank),
+    (frozenset(['max_length']), _check_max_length),
+    (frozenset(['min_length']), _check_min_length),
+) + _STRING_CHECKS
+
+# how many validations of schema node pass between reorderings of its checks
+ADAPTIVE_REORDER_EVERY = 256
+
+_check_order = {'adaptive': False}
+# max count of schema nodes with statistics; least recently used ones are dropped
+# (schemas made anew on every call never gather enough runs to be reordered anyway)
+ADAPTIVE_STATS_SIZE = 1024
+
+_adaptive_stats = OrderedDict()  # type: OrderedDict[int, _CheckStats]
+
+
+class _CheckStats:
+    """
+        Checks of one schema node with their cost and failure statistics.
+        Checks are reordered by "probability of failure per unit of cost", so
+        cheap and often failing checks run first.
+    """
+
+    __slots__ = ('schema', 'checks', 'order', 'calls', 'fails', 'cost', 'runs')
+
+    def __init__(self, schema: Dict[str, Any]) -> None:
+        self.schema = schema  # keeps id(schema) from reusing while stats exist
+        self.checks = [check for keys, check in _INDEPENDENT_CHECKS if not keys.isdisjoint(schema)]
+        self.order = list(range(len(self.checks)))
+        self.calls = [0] * len(self.checks)
+        self.fails = [0] * len(self.checks)
+        self.cost = [0.0] * len(self.checks)
+        self.runs = 0
+
+    def run(self, obj: ObjType, key: str) -> None:
+        self.runs += 1
+        if self.runs % ADAPTIVE_REORDER_EVERY == 0:
+            self.reorder()
+        for i in self.order:
+            start = time.perf_counter()
+            try:
+                self.checks[i](obj, self.schema, key)
+            except ValueError:
+                self.fails[i] += 1
+                raise
+            except Exception:
+                # check may rely on an earlier one (filter guarding len() of max_length),
+                # so result must be the same as in declared order
+                _declared_checks(obj=obj, schema=self.schema, key=key)
+                raise
+            finally:
+                self.cost[i] += time.perf_counter() - start
+                self.calls[i] += 1
+
+    def _score(self, i: int) -> float:
+        if not self.calls[i]:
+            # not measured yet - let it run first
+            return float('inf')
+        fail_rate = (self.fails[i] + 1) / (self.calls[i] + 2)
+        return fail_rate / max(self.cost[i] / self.calls[i], 1e-9)
+
+    def reorder(self) -> None:
+        self.order = sorted(self.order, key=self._score, reverse=True)
+
+
+def set_check_order(mode: str) -> None:
+    """
+        mode - "declared" (default) - checks run in fixed order:
+                 type, filter (in declaration order), blank, max/min_length, bytes length, charset, format, pattern
+               "adaptive" - type check runs first, the rest checks (all filters as one check) are timed and
+                 periodically reordered by "most likely to fail per unit cost first"
+                 (if reordered check raises anything but ValueError, checks are rerun in declared order,
+                 so callers get the same error as in "declared" mode)
+        Statistics are kept per schema node (dict object) for ADAPTIVE_STATS_SIZE most recently used nodes,
+        so schemas should be defined once (module-level or SchemaRegistry), not inline in every call
+    """
+    if mode not in {'declared', 'adaptive'}:
+        raise ValueError('unknown check order "{}"'.format(mode))
+    _check_order['adaptive'] = mode == 'adaptive'
+
+
+def reset_check_stats() -> None:
+    _adaptive_stats.clear()
+
+
+def _adaptive_checks(obj: ObjType, schema: Dict[str, Any], key: str) -> None:
+    stats = _adaptive_stats.get(id(schema))
+    if stats is None:
+        stats = _adaptive_stats[id(schema)] = _CheckStats(schema)
+        if len(_adaptive_stats) > ADAPTIVE_STATS_SIZE:
+            _adaptive_stats.popitem(last=False)
+    else:
+        _adaptive_stats.move_to_end(id(schema))
+    stats.run(obj, key)
+
+
+def _generic_checks(
+    obj: ObjType,
+    schema: SchemaType,
+    schema_type: Type,
+    extra: str,
+    key: str,
+    typed: bool = False,
+) -> ObjType:
+    if not typed and not isinstance(obj, schema_type):
+        _on_error(schema, 'expected type "{}" {} ; got {}'.format(schema_type, extra, type(obj)))
+    if _check_order['adaptive']:
+        _adaptive_checks(obj=obj, schema=schema, key=key)
+    else:
+        _declared_checks(obj=obj, schema=schema, key=key)
     return obj
 
 
-def _validate_generic(obj: ObjType, schema: SchemaType, schema_type: Type, key: str, extra: str) -> ObjType:
-    obj = _generic_checks(obj=obj, schema=schema, schema_type=schema_type, key=key, extra=extra)
+def _declared_checks(obj: ObjType, schema: Dict[str, Any], key: str) -> None:
+    if 'filter' in schema and not _check_filter(obj, schema['filter']):
+        _on_error(schema, '"{}" not passed filter'.format(key))
+    if 'blank' in schema:
+        _check_blank(obj=obj, schema=schema, key=key)
+    if 'max_length' in schema:
+        _check_max_length(obj=obj, schema=schema, key=key)
+    if 'min_length' in schema:
+        _check_min_length(obj=obj, schema=schema, key=key)
+    if not _STRING_KEYS.isdisjoint(schema):
+        for keys, check in _STRING_CHECKS:
+            if not keys.isdisjoint(schema):
+                check(obj=obj, schema=schema, key=key)
+
+
+def _validate_generic(
+    obj: ObjType,
+    schema: SchemaType,
+    schema_type: Type,
+    key: str,
+    extra: str,
+    typed: bool = False,
+    ctx: Optional[_Context] = None,
+) -> ObjType:
+    obj = _generic_checks(obj=obj, schema=schema, schema_type=schema_type, key=key, extra=extra, typed=typed)
     if isinstance(schema_type, type) and issubclass(schema_type, (list, tuple)) and 'value' in schema:
+        if ctx is not None:
+            ctx.descend(obj, extra)
         try:
-            obj = schema_type(_apply(i, schema['value'], key=key) for i in obj)
+            batch = _batch_coercion(schema['value'])
+            if batch is None:
+                obj = schema_type(_apply(i, schema['value'], key, ctx) for i in obj)
+            else:
+                if ctx is not None:
+                    # items are not passed to _apply, so count them at once
+                    ctx.count(len(obj), extra)
+                obj = _coerce_all(obj=obj, schema=schema['value'], schema_type=schema_type, func=batch, extra=extra)
         except ValueError as ex:
             _on_error(schema, ex)
+        if ctx is not None:
+            ctx.depth -= 1
     elif isinstance(schema_type, type) and issubclass(schema_type, dict):
-        obj = _validate_dict(obj=obj, schema=schema, extra=extra)
+        if ctx is not None:
+            ctx.descend(obj, extra)
+        obj = _validate_dict(obj=obj, schema=schema, extra=extra, ctx=ctx)
+        if ctx is not None:
+            ctx.depth -= 1
     return obj
 
 
-def _validate(obj: ObjType, schema: SchemaType, key: str, extra: str) -> ObjType:
+def _validate(
+    obj: ObjType,
+    schema: SchemaType,
+    key: str,
+    extra: str,
+    typed: bool = False,
+    ctx: Optional[_Context] = None,
+) -> ObjType:
     schema_type = _get_type(schema)
     if schema_type in {'const', 'enum'}:
         return _validate_const_enum(obj=obj, schema=schema, schema_type=schema_type, key=key)
-    return _validate_generic(obj=obj, schema=schema, schema_type=schema_type, extra=extra, key=key)
+    return _validate_generic(
+        obj=obj,
+        schema=schema,
+        schema_type=schema_type,
+        extra=extra,
+        key=key,
+        typed=typed,
+        ctx=ctx,
+    )
+
+
+_COERCE_ERRORS = (ValueError, TypeError, ArithmeticError, OSError)
+_BATCH_KEYS = frozenset([type, 'type', 'coerce'])
+
+
+def _coerce(obj: ObjType, schema: Dict[str, Any], extra: str) -> Tuple[ObjType, bool]:
+    """
+        returns converted value and flag if type check can be skipped
+    """
+    func, result_type = get_coercion(schema['coerce'])
+    try:
+        obj = func(obj)
+    except _COERCE_ERRORS:
+        _on_error(schema, CoerceError(obj, schema['coerce'], extra))
+    schema_type = schema.get(type, schema.get('type'))
+    return obj, isinstance(schema_type, (type, tuple)) and issubclass(result_type, schema_type)
+
+
+def _batch_coercion(schema: SchemaType) -> Optional[Callable]:
+    # item schema like {type: int, 'coerce': 'int'} - whole list is converted without _apply for each item
+    if not isinstance(schema, dict) or 'coerce' not in schema or not _BATCH_KEYS.issuperset(schema):
+        return None
+    func, result_type = get_coercion(schema['coerce'])
+    schema_type = schema.get(type, schema.get('type'))
+    if not isinstance(schema_type, (type, tuple)) or not issubclass(result_type, schema_type):
+        return None
+    return func
+
+
+def _coerce_all(obj: ObjType, schema: Dict[str, Any], schema_type: Type, func: Callable, extra: str) -> ObjType:
+    try:
+        return schema_type(map(func, obj))
+    except _COERCE_ERRORS:
+        pass
+    # slow path only to find out bad value
+    for i in obj:
+        try:
+            func(i)
+        except _COERCE_ERRORS:
+            raise CoerceError(i, schema['coerce'], extra) from None
+    raise CoerceError(obj, schema['coerce'], extra)
 
 
 def _apply_callable(obj: ObjType, func: Union[Callable, Iterable[Callable]]) -> ObjType:
@@ -119,8 +453,10 @@ def _apply_callable(obj: ObjType, func: Union[Callable, Iterable[Callable]]) ->
     return obj
 
 
-def _apply(obj: ObjType, schema: SchemaType, key: str) -> ObjType:
+def _apply(obj: ObjType, schema: SchemaType, key: str, ctx: Optional[_Context] = None) -> ObjType:
     extra = ''.join(['for ', key]) if key else ''
+    if ctx is not None:
+        ctx.enter(obj, extra)
     if not isinstance(schema, (dict, type, tuple)) and schema not in {'const', 'enum'}:
         raise ValueError('schema must be type, dict, tuple or "const"/"enum" {}'.format(extra))
 
@@ -135,17 +471,37 @@ def _apply(obj: ObjType, schema: SchemaType, key: str) -> ObjType:
     if 'pre_call' in schema:
         obj = _apply_callable(obj, schema['pre_call'])
 
-    obj = _validate(obj=obj, schema=schema, key=key, extra=extra)
+    typed = False
+    if 'coerce' in schema:
+        obj, typed = _coerce(obj=obj, schema=schema, extra=extra)
+
+    obj = _validate(obj=obj, schema=schema, key=key, extra=extra, typed=typed, ctx=ctx)
 
     if 'post_call' in schema:
         obj = _apply_callable(obj, schema['post_call'])
     return obj
 
 
-def validate(obj: ObjType, schema: SchemaType) -> ObjType:
+def validate(
+    obj: ObjType,
+    schema: SchemaType,
+    *,
+    max_depth: Optional[int] = None,
+    max_items: Optional[int] = None,
+    max_nodes: Optional[int] = None,
+    deadline: Optional[float] = None,
+    intern_keys: bool = False
+) -> ObjType:
     """
         obj - some object
         schema - schema_checker
+        max_depth - max nesting of validated containers (dict/list/tuple)
+        max_items - max length of any list/tuple/dict/set (checked before pre_call and after it)
+        max_nodes - max count of validated values in total
+        deadline - max time of validation in seconds
+          all limits are checked while walking obj and raise LimitExceeded (subclass of ValueError, ignores "errmsg")
+        intern_keys - intern str keys of validated dicts that are not listed in schema (any_key and unexpected ones);
+          keys listed in schema are always the schema's own key objects
         schema ::= type of this object : list/dict/str/int/float (can be tuple of types) or "const"/"enum"
           OR
         schema ::= dict - {
@@ -156,21 +512,42 @@ def validate(obj: ObjType, schema: SchemaType) -> ObjType:
                            - const - some value to be compared with using method
                            - enum - list/set/dict/tuple to check if obj __contains__ in "value"
           "any_key"     : need for obj type of dict - schema for all keys (ignores if value is set)
-          "default"    : default value if this object does not exists (if callable will be called)
+          "default"    : default value if this object does not exists (if callable will be called,
+                         otherwise the same object is shared by all results)
           "filter"     : any of
                            - Callable[value -> bool] - if false then raise error
                            - Iterable[Callable[value -> bool]] - if any of them return false then raise error
           "pre_call"   : any of
                            - Callable[value -> value] - will be called before checking type and call filter's functions
                            - Iterable[Callable[value -> value]] - will call all of them
+          "coerce"     : name of built-in conversion from coerce.COERCIONS, applied after "pre_call":
+                           "int", "float", "decimal", "bool", "datetime" (ISO-8601), "timestamp" (epoch -> UTC datetime)
+                           raises CoerceError (subclass of ValueError) if value can't be converted
           "post_call"  : any of
                            - Callable[value -> value] - will be called after checking type and call filter's functions
                            - Iterable[Callable[value -> value]] - will call all of them
           "blank"      : raise error if value is blank
           "max_length" : extra check of length (len)
           "min_length" : extra check of length (len)
+          "max_bytes"  : extra check of length in bytes (str is measured as utf-8)
+          "min_bytes"  : extra check of length in bytes (str is measured as utf-8)
+          "charset"    : "ascii", name from formats.CHARSETS ("digits", "hexdigits", "letters", "alnum", "printable")
+                         or set/frozenset of allowed chars
+          "format"     : name from formats.FORMATS: "email", "uuid", "iso-date", "ipv4", "ipv6"
+                         (bytes are decoded as ascii)
+          "pattern"    : regex (str/bytes or compiled) - value must fully match it; str is compiled only once
           "unexpected" : allow unexpected keys (for dict)
           "errmsg"     : will be in ValueError in case of error on this level
         }
+        order of checks after type check can be made adaptive by set_check_order("adaptive")
     """
-    return _apply(obj, schema, 'Top-level')
+    ctx = None
+    if max_depth is not None or max_items is not None or max_nodes is not None or deadline is not None or intern_keys:
+        ctx = _Context(
+            max_depth=max_depth,
+            max_items=max_items,
+            max_nodes=max_nodes,
+            deadline=deadline,
+            intern_keys=intern_keys,
+        )
+    return _apply(obj, schema, 'Top-level', ctx)
@@ -0,0 +1,208 @@
+from typing import Any, Dict, Iterator, NoReturn, Tuple, Type
+from collections.abc import Mapping, Sequence
+
+from .jschema import (
+    ObjType,
+    SchemaType,
+    _apply,
+    _apply_callable,
+    _check_dict_key,
+    _coerce,
+    _default,
+    _generic_checks,
+    _get_type,
+    _on_error,
+)
+
+_MISSED = object()
+
+
+def _is_lazy(schema: SchemaType) -> bool:
+    # post_call needs whole value, so such nodes are validated eagerly
+    if not isinstance(schema, dict) or 'post_call' in schema:
+        return False
+    schema_type = _get_type(schema)
+    if not isinstance(schema_type, type):
+        return False
+    if issubclass(schema_type, dict):
+        return 'value' in schema or 'any_key' in schema
+    return issubclass(schema_type, (list, tuple)) and 'value' in schema
+
+
+def _force(value: Any) -> Any:
+    return value.force() if isinstance(value, (LazyDict, LazySequence)) else value
+
+
+def _eq(view: Any, other: Any) -> bool:
+    # compares fully validated values, so it may raise ValueError as .force() does
+    return view.force() == _force(other)
+
+
+def _on_errors(schemas: Tuple[SchemaType, ...], ex: ValueError) -> NoReturn:
+    # same as chain of _on_error() in eager validation: from inner schema to outer one
+    for schema in schemas:
+        try:
+            _on_error(schema, ex)
+        except ValueError as new_ex:
+            ex = new_ex
+    raise ex
+
+
+def _lazy_apply(obj: ObjType, schema: SchemaType, key: str, parents: Tuple[SchemaType, ...] = ()) -> Any:
+    if not _is_lazy(schema):
+        return _apply(obj, schema, key)
+    extra = ''.join(['for ', key]) if key else ''
+    if 'pre_call' in schema:
+        obj = _apply_callable(obj, schema['pre_call'])
+    typed = False
+    if 'coerce' in schema:
+        obj, typed = _coerce(obj=obj, schema=schema, extra=extra)
+    schema_type = _get_type(schema)
+    obj = _generic_checks(obj=obj, schema=schema, schema_type=schema_type, extra=extra, key=key, typed=typed)
+    if issubclass(schema_type, dict):
+        return LazyDict(obj=obj, schema=schema, extra=extra, parents=parents)
+    return LazySequence(obj=obj, schema=schema, schema_type=schema_type, key=key, parents=parents)
+
+
+class LazyDict(Mapping):
+    """
+        Read-only view of dict validated by schema.
+        Keys are checked on creation, values - on first access (and then cached).
+    """
+
+    __slots__ = ('_obj', '_schema', '_schemas', '_keys', '_cache')
+
+    def __init__(
+        self,
+        obj: Dict[Any, Any],
+        schema: Dict[str, Any],
+        extra: str,
+        parents: Tuple[SchemaType, ...] = (),
+    ) -> None:
+        self._obj = obj
+        self._schema = schema
+        # this schema and all outer ones - for errmsg
+        self._schemas = (schema,) + parents
+        self._cache = {}  # type: Dict[Any, Any]
+        if 'value' in schema:
+            keys = _check_dict_key(obj=obj, schema=schema, extra=extra)
+            keys.update(dict.fromkeys(schema['value']))
+            self._keys = keys
+        else:
+            self._keys = obj
+
+    def _validate_item(self, key: Any) -> Any:
+        schema = self._schema
+        if 'value' not in schema:
+            return _lazy_apply(self._obj[key], schema['any_key'], key, self._schemas)
+        if key not in schema['value']:
+            # allowed unexpected key
+            return self._obj[key]
+        if key not in self._obj:
+            return _default(schema['value'][key]['default'])
+        return _lazy_apply(self._obj[key], schema['value'][key], key, self._schemas)
+
+    def __getitem__(self, key: Any) -> Any:
+        value = self._cache.get(key, _MISSED)
+        if value is _MISSED:
+            if key not in self._keys:
+                raise KeyError(key)
+            try:
+                value = self._validate_item(key)
+            except ValueError as ex:
+                _on_errors(self._schemas, ex)
+            self._cache[key] = value
+        return value
+
+    def __contains__(self, key: Any) -> bool:
+        # without validation of value
+        return key in self._keys
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self._keys)
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __eq__(self, other: Any) -> bool:
+        return _eq(self, other)
+
+    def __repr__(self) -> str:
+        return '{}({} of {} validated)'.format(type(self).__name__, len(self._cache), len(self._keys))
+
+    def force(self) -> Dict[Any, Any]:
+        """
+            validate all the rest values and return validated dict
+        """
+        return {i: _force(self[i]) for i in self._keys}
+
+
+class LazySequence(Sequence):
+    """
+        Read-only view of list/tuple validated by schema.
+        Items are validated on first access (and then cached).
+    """
+
+    __slots__ = ('_obj', '_schema', '_schemas', '_schema_type', '_key', '_cache')
+
+    def __init__(
+        self,
+        obj: Sequence,
+        schema: Dict[str, Any],
+        schema_type: Type,
+        key: str,
+        parents: Tuple[SchemaType, ...] = (),
+    ) -> None:
+        self._obj = obj
+        self._schema = schema
+        self._schemas = (schema,) + parents
+        self._schema_type = schema_type
+        self._key = key
+        self._cache = [_MISSED] * len(obj)
+
+    def _get(self, index: int) -> Any:
+        value = self._cache[index]
+        if value is _MISSED:
+            try:
+                value = _lazy_apply(self._obj[index], self._schema['value'], self._key, self._schemas)
+            except ValueError as ex:
+                _on_errors(self._schemas, ex)
+            self._cache[index] = value
+        return value
+
+    def __getitem__(self, index: Any) -> Any:
+        if isinstance(index, slice):
+            return self._schema_type(self._get(i) for i in range(*index.indices(len(self._cache))))
+        return self._get(index)
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def __eq__(self, other: Any) -> bool:
+        return _eq(self, other)
+
+    def __repr__(self) -> str:
+        return '{}({} of {} validated)'.format(
+            type(self).__name__,
+            sum(i is not _MISSED for i in self._cache),
+            len(self._cache),
+        )
+
+    def force(self) -> Sequence:
+        """
+            validate all the rest items and return validated list/tuple
+        """
+        return self._schema_type(_force(self._get(i)) for i in range(len(self._cache)))
+
+
+def validate_lazy(obj: ObjType, schema: SchemaType) -> Any:
+    """
+        Same as validate(), but for dict/list/tuple schemas returns LazyDict/LazySequence:
+        type, filter, length and keys checks are done right away,
+        each value (with its pre_call/post_call) is validated only on first access.
+        Nested dict/list/tuple values are lazy too.
+        Use .force() to finish validation and get plain dict/list/tuple.
+        Views are compared (==) by their fully validated values.
+        Schemas of other types and with "post_call" on container are validated eagerly.
+    """
+    return _lazy_apply(obj, schema, 'Top-level')
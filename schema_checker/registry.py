@@ -0,0 +1,117 @@
+from typing import Any, Dict, Hashable, Set, Tuple
+
+from .jschema import ObjType, SchemaType, validate
+
+_SEQUENCES = (list, tuple)
+_MUTABLE = (list, dict, set, bytearray)
+
+
+def _leaf_key(value: Any, exact: bool = False) -> Hashable:
+    """
+        structural key of non-schema value: containers by content, the rest by type and value
+        (callables and types are compared by identity)
+        exact - for values that get into validated result: mutable containers (even nested in tuples)
+                are compared by identity, the rest values also by repr, so equal but different values
+                (Decimal('1.0') and Decimal('1.00'), 0.0 and -0.0, same moment in different timezones)
+                are not merged
+    """
+    if exact and isinstance(value, _MUTABLE):
+        # the object itself is kept alive by prepared node
+        return 'id', id(value)
+    if isinstance(value, _SEQUENCES):
+        return type(value), tuple(_leaf_key(i, exact) for i in value)
+    if isinstance(value, (set, frozenset)):
+        return type(value), frozenset(_leaf_key(i, exact) for i in value)
+    if isinstance(value, dict):
+        return type(value), tuple((_leaf_key(k, exact), _leaf_key(v, exact)) for k, v in value.items())
+    try:
+        hash(value)
+    except TypeError:
+        # unhashable object: by identity, the object itself is kept alive by prepared node
+        return 'id', id(value)
+    if exact:
+        return type(value), repr(value), value
+    # type is a part of key, so 1, 1.0 and True are different
+    return type(value), value
+
+
+class SchemaRegistry:
+    """
+        Named schemas, where structurally identical sub-schemas are replaced by one shared prepared node.
+        Sub-schemas are equal if they have the same keys with equal values;
+        callables (filter, pre_call, default, ...) and types are compared by identity.
+        Shared nodes mean less memory and that per-node data (like adaptive check statistics)
+        is shared by all schemas using the same fragment.
+        Prepared schemas must not be changed.
+    """
+
+    def __init__(self) -> None:
+        self._nodes = {}  # type: Dict[Hashable, SchemaType]
+        self._schemas = {}  # type: Dict[str, SchemaType]
+
+    def _prepare(self, schema: SchemaType, active: Set[int]) -> Tuple[SchemaType, Hashable]:
+        if not isinstance(schema, dict):
+            return schema, _leaf_key(schema)
+        if id(schema) in active:
+            raise ValueError('recursive schemas are not supported')
+        active.add(id(schema))
+        schema_type = schema.get(type, schema.get('type'))
+        node = {}
+        keys = []
+        for name, value in schema.items():
+            if name == 'any_key' or (
+                name == 'value' and isinstance(schema_type, type) and issubclass(schema_type, _SEQUENCES)
+            ):
+                value, key = self._prepare(value, active)
+            elif (
+                name == 'value' and isinstance(value, dict)
+                and isinstance(schema_type, type) and issubclass(schema_type, dict)
+            ):
+                fields = [(field, self._prepare(sub_schema, active)) for field, sub_schema in value.items()]
+                value = {field: sub_schema for field, (sub_schema, _) in fields}
+                # order of fields is order of keys in result, so it matters
+                key = dict, tuple((_leaf_key(field), sub_key) for field, (_, sub_key) in fields)
+            else:
+                # default (and const value) may get into validated result or be compared with it,
+                # so they are keyed exactly; enum values are safe to share by equality
+                key = _leaf_key(value, name == 'default' or (name == 'value' and schema_type == 'const'))
+            node[name] = value
+            keys.append((name, key))
+        active.discard(id(schema))
+        key = 'schema', frozenset(keys)
+        return self._nodes.setdefault(key, node), key
+
+    def prepare(self, schema: SchemaType) -> SchemaType:
+        """
+            returns copy of schema made of shared prepared nodes (source schema is not changed)
+        """
+        return self._prepare(schema, set())[0]
+
+    def register(self, name: str, schema: SchemaType) -> SchemaType:
+        """
+            prepare schema and save it as name; returns prepared schema
+        """
+        schema = self._schemas[name] = self.prepare(schema)
+        return schema
+
+    def validate(self, obj: ObjType, name: str, **kwargs: Any) -> ObjType:
+        """
+            validate obj by schema registered as name; kwargs are passed to validate()
+        """
+        return validate(obj, self._schemas[name], **kwargs)
+
+    def __getitem__(self, name: str) -> SchemaType:
+        return self._schemas[name]
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._schemas
+
+    def __len__(self) -> int:
+        return len(self._schemas)
+
+    @property
+    def nodes_count(self) -> int:
+        """
+            count of unique prepared dict nodes
+        """
+        return len(self._nodes)
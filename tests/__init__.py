@@ -1,8 +1,13 @@
-
 from .jschema import TestJschema
 from .extras import TestExtras
+from .lazy import TestLazy
+from .cli import TestCli
+from .registry import TestRegistry
 
 __all__ = [
     'TestJschema',
     'TestExtras',
+    'TestLazy',
+    'TestCli',
+    'TestRegistry',
 ]
@@ -0,0 +1,94 @@
+from unittest import TestCase
+import json
+import os
+import tempfile
+
+from schema_checker.cli import main, split_shards, validate_files
+
+SCHEMA = {
+    'type': dict,
+    'value': {
+        'id': int,
+        'name': str,
+    },
+}
+
+BROKEN_SCHEMA = {
+    'type': dict,
+    'value': {
+        'id': {'type': int, 'max_length': 1},
+        'name': str,
+    },
+}
+
+
+class TestCli(TestCase):
+
+    def setUp(self):
+        lines = [
+            json.dumps({'id': i, 'name': str(i)}) if i % 10 else json.dumps({'id': str(i)})
+            for i in range(1, 101)
+        ]
+        lines.insert(5, '')
+        lines.insert(50, 'not json')
+        self.data = '\n'.join(lines).encode()
+        fd, self.path = tempfile.mkstemp(suffix='.ndjson')
+        with os.fdopen(fd, 'wb') as f:
+            f.write(self.data)
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_split_shards(self):
+        shards = split_shards(self.path, 7)
+        self.assertEqual(shards[0][1], 0)
+        self.assertEqual(shards[-1][2], len(self.data))
+        for (_, _, end), (_, start, _) in zip(shards, shards[1:]):
+            self.assertEqual(end, start)
+            self.assertEqual(self.data[start - 1:start], b'\n')
+
+    def test_validate_files(self):
+        bad_offsets = [
+            offset
+            for offset, line in zip(
+                [0] + [i + 1 for i, c in enumerate(self.data) if c == ord('\n')],
+                self.data.split(b'\n'),
+            )
+            if line == b'not json' or line.startswith(b'{"id": "')
+        ]
+        for workers in (1, 3):
+            report = validate_files([self.path], 'tests.cli:SCHEMA', workers=workers, max_errors=3)[self.path]
+            self.assertEqual(report['records'], 101)
+            self.assertEqual(report['invalid'], 11)
+            self.assertEqual(report['valid'], 90)
+            self.assertEqual(report['bad_offsets'], bad_offsets)
+            self.assertEqual([i['offset'] for i in report['errors']], bad_offsets[:3])
+
+    def test_unexpected_exceptions(self):
+        with open(self.path, 'wb') as f:
+            f.write(b'[' * 200000 + b'\n{"id": 1, "name": "a"}\n')
+        report = validate_files([self.path], 'tests.cli:SCHEMA', workers=1)[self.path]
+        self.assertEqual(report['records'], 2)
+        self.assertEqual(report['invalid'], 1)
+        self.assertEqual(report['bad_offsets'], [0])
+        self.assertTrue(report['errors'][0]['error'].startswith('RecursionError: '))
+        report = validate_files([self.path], 'tests.cli:BROKEN_SCHEMA', workers=1)[self.path]
+        self.assertEqual(report['invalid'], 2)
+        self.assertTrue(report['errors'][1]['error'].startswith('TypeError: '))
+
+    def test_bad_schema_ref(self):
+        for ref in ['nosuchmod:X', 'tests.cli:NO_SUCH_SCHEMA', 'tests.cli']:
+            with self.assertRaises(ValueError):
+                validate_files([self.path], ref, workers=2)
+            self.assertEqual(main(['validate', '--schema', ref, '--workers', '2', self.path]), 2)
+
+    def test_main(self):
+        fd, output = tempfile.mkstemp(suffix='.json')
+        os.close(fd)
+        try:
+            code = main(['validate', '--schema', 'tests.cli:SCHEMA', '--workers', '1', '--output', output, self.path])
+            self.assertEqual(code, 1)
+            with open(output) as f:
+                self.assertEqual(json.load(f)[self.path]['invalid'], 11)
+        finally:
+            os.remove(output)
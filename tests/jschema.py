@@ -1,7 +1,19 @@
 
+import json
+import re
+import time
 import unittest
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
 
-from schema_checker import validate
+from schema_checker import validate, CoerceError, LimitExceeded
+from schema_checker.jschema import (
+    ADAPTIVE_REORDER_EVERY,
+    ADAPTIVE_STATS_SIZE,
+    _adaptive_stats,
+    reset_check_stats,
+    set_check_order,
+)
 
 
 class TestJschema(unittest.TestCase):
@@ -456,4 +468,295 @@ class TestJschema(unittest.TestCase):
                 }
             },
             obj,
-        )
\ No newline at end of file
+        )
+
+    def test_pattern(self):
+        schema = {
+            'type': str,
+            'pattern': r'[a-z]+\d*',
+        }
+        self.do_test('abc123', schema, 'abc123')
+        self.do_test('abc123!', schema, 'abc123!', False)
+        self.do_test('123abc', schema, '123abc', False)
+
+    def test_compiled_pattern(self):
+        schema = {
+            'type': bytes,
+            'pattern': re.compile(rb'\d+'),
+        }
+        self.do_test(b'123', schema, b'123')
+        self.do_test(b'12a', schema, b'12a', False)
+
+    def test_pattern_type_mismatch(self):
+        msg = 'pattern of type str can not be used for value of type bytes'
+        self.do_test(b'123', {'type': bytes, 'pattern': r'\d+'}, b'123', False, msg)
+        self.do_test('123', {'type': str, 'pattern': re.compile(rb'\d+')}, '123', False)
+
+    def test_format(self):
+        cases = {
+            'email': ('user.name@example.com', 'user@localhost'),
+            'uuid': ('1b4e28ba-2fa1-11d2-883f-0016d3cca427', '1b4e28ba-2fa1-11d2-883f-0016d3cca42'),
+            'iso-date': ('2020-02-29', '2019-02-29'),
+            'ipv4': ('192.168.0.1', '256.1.1.1'),
+            'ipv6': ('::1', '::g'),
+        }
+        for name, (good, bad) in cases.items():
+            schema = {
+                'type': str,
+                'format': name,
+            }
+            self.do_test(good, schema, good)
+            self.do_test(bad, schema, bad, False)
+
+    def test_format_bytes(self):
+        schema = {
+            'type': bytes,
+            'format': 'email',
+        }
+        self.do_test(b'a@b.c', schema, b'a@b.c')
+        self.do_test(b'a@b', schema, b'a@b', False)
+        self.do_test('я@b.c'.encode(), schema, 'я@b.c'.encode(), False)
+
+    def test_string_checks_not_text(self):
+        cases = [
+            ({'max_bytes': 3}, '"max_bytes/min_bytes" can only be used for str or bytes value, got int'),
+            ({'format': 'email'}, '"format" can only be used for str or bytes value, got int'),
+            ({'charset': 'digits'}, '"charset" can only be used for str or bytes value, got int'),
+            ({'pattern': rb'\d+'}, '"pattern" can only be used for str or bytes value, got int'),
+        ]
+        for checks, msg in cases:
+            self.do_test(5, dict(checks, type=(str, int)), 5, False, msg)
+
+    def test_format_unknown(self):
+        self.do_test('abc', {'type': str, 'format': 'unknown'}, 'abc', False)
+
+    def test_charset(self):
+        schema = {
+            'type': str,
+            'charset': 'ascii',
+        }
+        self.do_test('abc', schema, 'abc')
+        self.do_test('абв', schema, 'абв', False)
+        schema = {
+            'type': str,
+            'charset': 'hexdigits',
+        }
+        self.do_test('deadBEEF', schema, 'deadBEEF')
+        self.do_test('xyz', schema, 'xyz', False)
+        schema = {
+            'type': str,
+            'charset': frozenset('01'),
+        }
+        self.do_test('0110', schema, '0110')
+        self.do_test('012', schema, '012', False)
+
+    def test_charset_bytes(self):
+        for charset in ['digits', frozenset('0123456789'), set('0123456789'), list('0123456789'), b'0123456789']:
+            schema = {
+                'type': bytes,
+                'charset': charset,
+            }
+            self.do_test(b'123', schema, b'123')
+            self.do_test(b'12a', schema, b'12a', False)
+            schema = {
+                'type': str,
+                'charset': charset,
+            }
+            self.do_test('123', schema, '123')
+            self.do_test('12a', schema, '12a', False)
+        self.do_test(b'abc', {'type': bytes, 'charset': 'ascii'}, b'abc')
+
+    def test_bytes_length(self):
+        schema = {
+            'type': str,
+            'max_bytes': 4,
+            'min_bytes': 2,
+        }
+        self.do_test('ab', schema, 'ab')
+        self.do_test('абв', schema, 'абв', False)
+        self.do_test('a', schema, 'a', False)
+
+    def test_coerce(self):
+        cases = [
+            ('int', int, '42', 42),
+            ('float', float, '1.5', 1.5),
+            ('decimal', Decimal, '0.10', Decimal('0.10')),
+            ('decimal', Decimal, 0.1, Decimal('0.1')),
+            ('bool', bool, 'Yes', True),
+            ('bool', bool, 'off', False),
+            ('datetime', datetime, '2020-01-02', datetime(2020, 1, 2)),
+            ('datetime', datetime, '2020-01-02T03:04:05.5Z', datetime(2020, 1, 2, 3, 4, 5, 500000, timezone.utc)),
+            (
+                'datetime',
+                datetime,
+                '2020-01-02 03:04+03:00',
+                datetime(2020, 1, 2, 3, 4, tzinfo=timezone(timedelta(hours=3))),
+            ),
+            ('timestamp', datetime, '0', datetime(1970, 1, 1, tzinfo=timezone.utc)),
+            ('timestamp', datetime, 86400, datetime(1970, 1, 2, tzinfo=timezone.utc)),
+        ]
+        for name, schema_type, obj, result in cases:
+            self.do_test(obj, {'type': schema_type, 'coerce': name}, result)
+
+    def test_coerce_error(self):
+        cases = [('int', '4x'), ('int', None), ('decimal', 'NaN'), ('bool', 'maybe'), ('datetime', '2020-13-01')]
+        for name, obj in cases:
+            with self.assertRaises(CoerceError) as ctx:
+                validate({'a': obj}, {'type': dict, 'value': {'a': {'type': object, 'coerce': name}}})
+            self.assertEqual(ctx.exception.value, obj)
+            self.assertEqual(ctx.exception.coerce, name)
+        self.do_test('x', {'type': int, 'coerce': 'int', 'errmsg': 'bad int'}, 1, False, 'bad int')
+
+    def test_coerce_type_check(self):
+        self.do_test('1', {'type': str, 'coerce': 'int'}, 1, False)
+
+    def test_coerce_after_pre_call(self):
+        self.do_test(' 7 ', {'type': int, 'pre_call': str.strip, 'coerce': 'int'}, 7)
+
+    def test_coerce_list(self):
+        schema = {
+            'type': list,
+            'value': {'type': int, 'coerce': 'int'},
+        }
+        self.do_test(['1', 2, '3'], schema, [1, 2, 3])
+        with self.assertRaises(CoerceError) as ctx:
+            validate(['1', 'b', '3'], schema)
+        self.assertEqual(ctx.exception.value, 'b')
+        schema = {
+            'type': tuple,
+            'value': {'type': int, 'coerce': 'int', 'filter': lambda x: x > 0},
+        }
+        self.do_test(('1', '2'), schema, (1, 2))
+        self.do_test(('1', '-2'), schema, (1, -2), False)
+
+    def test_adaptive_check_order(self):
+        calls = []
+        schema = {
+            'type': str,
+            'filter': lambda x: calls.append(x) or True,
+            'max_length': 3,
+        }
+        set_check_order('adaptive')
+        try:
+            self.do_test('abc', schema, 'abc')
+            for _ in range(ADAPTIVE_REORDER_EVERY):
+                self.do_test('abcd', schema, 'abcd', False, '"Top-level" > max_length')
+            calls.clear()
+            self.do_test('abcd', schema, 'abcd', False, '"Top-level" > max_length')
+            # max_length always fails, so it goes before filter
+            self.assertEqual(calls, [])
+            self.do_test('abc', schema, 'abc')
+            self.assertEqual(calls, ['abc'])
+        finally:
+            set_check_order('declared')
+            reset_check_stats()
+        calls.clear()
+        self.do_test('abcd', schema, 'abcd', False)
+        self.assertEqual(calls, ['abcd'])
+
+    def test_adaptive_filters_order(self):
+        schema = {
+            'type': str,
+            'filter': [lambda s: len(s) > 0, lambda s: s[0] == 'a'],
+            'max_length': 10,
+        }
+        set_check_order('adaptive')
+        try:
+            for i in range(ADAPTIVE_REORDER_EVERY * 2):
+                obj = '' if i % 50 == 0 else 'bcd'
+                self.do_test(obj, schema, obj, False, '"Top-level" not passed filter')
+        finally:
+            set_check_order('declared')
+            reset_check_stats()
+
+    def test_adaptive_guarded_checks(self):
+        schema = {
+            'type': (str, int),
+            'filter': lambda x: isinstance(x, str),
+            'max_length': 3,
+        }
+        set_check_order('adaptive')
+        try:
+            for _ in range(ADAPTIVE_REORDER_EVERY * 2):
+                self.do_test('abcd', schema, 'abcd', False, '"Top-level" > max_length')
+            # max_length goes first now, but int must still fail on filter, not on len()
+            self.do_test(5, schema, 5, False, '"Top-level" not passed filter')
+        finally:
+            set_check_order('declared')
+            reset_check_stats()
+
+    def test_adaptive_stats_bounded(self):
+        set_check_order('adaptive')
+        try:
+            for _ in range(ADAPTIVE_STATS_SIZE + 10):
+                self.do_test('abc', {'type': str, 'max_length': 3}, 'abc')
+            self.assertEqual(len(_adaptive_stats), ADAPTIVE_STATS_SIZE)
+        finally:
+            set_check_order('declared')
+            reset_check_stats()
+
+    def test_check_order_unknown(self):
+        with self.assertRaises(ValueError):
+            set_check_order('random')
+
+    def assert_limit(self, limit, obj, schema, **kwargs):
+        with self.assertRaises(LimitExceeded) as ctx:
+            validate(obj, schema, **kwargs)
+        self.assertEqual(ctx.exception.limit, limit)
+
+    def test_limits_ok(self):
+        schema = {'type': dict, 'any_key': {'type': list, 'value': int}}
+        obj = {'a': [1, 2], 'b': [3]}
+        self.assertEqual(validate(obj, schema, max_depth=2, max_items=2, max_nodes=6, deadline=1), obj)
+
+    def test_max_depth(self):
+        schema = {'type': list}
+        schema['value'] = schema
+        self.assert_limit('max_depth', [[[[]]]], schema, max_depth=3)
+
+    def test_max_items(self):
+        calls = []
+        schema = {
+            'type': dict,
+            'errmsg': 'must not hide limits',
+            'any_key': {
+                'type': list,
+                'pre_call': lambda x: calls.append(x) or x,
+            },
+        }
+        self.assert_limit('max_items', {'a': list(range(1000))}, schema, max_items=100)
+        # checked before pre_call
+        self.assertEqual(calls, [])
+        self.assert_limit('max_items', '1' * 1000, {'type': list, 'pre_call': list, 'value': str}, max_items=100)
+
+    def test_max_nodes(self):
+        self.assert_limit('max_nodes', [1] * 10, {'type': list, 'value': int}, max_nodes=10)
+
+    def test_max_nodes_batch_coercion(self):
+        schema = {'type': list, 'value': {'type': int, 'coerce': 'int'}}
+        self.assert_limit('max_nodes', ['1'] * 1000, schema, max_nodes=10)
+        self.assertEqual(validate(['1'] * 9, schema, max_nodes=10), [1] * 9)
+
+    def test_deadline(self):
+        schema = {'type': list, 'value': {'type': int, 'pre_call': lambda x: time.sleep(0.01) or x}}
+        self.assert_limit('deadline', [1] * 10, schema, deadline=0.02)
+
+    def test_intern_keys(self):
+        schema = {
+            'type': dict,
+            'value': {
+                'known': {'type': str, 'default': 'shared default'},
+                'nested': {'type': dict, 'any_key': int},
+            },
+            'unexpected': True,
+        }
+        first, second = (
+            validate(json.loads('{"unknown": 1, "nested": {"any": 1}}'), schema, intern_keys=True)
+            for _ in range(2)
+        )
+        self.assertEqual(first, {'unknown': 1, 'nested': {'any': 1}, 'known': 'shared default'})
+        for a, b in [(first, second), (first['nested'], second['nested'])]:
+            for i, j in zip(sorted(a), sorted(b)):
+                self.assertIs(i, j)
+        self.assertIs(first['known'], second['known'])
+        self.assertIs(next(i for i in first if i == 'known'), next(iter(schema['value'])))
@@ -0,0 +1,98 @@
+from unittest import TestCase
+
+from schema_checker import validate_lazy
+
+
+class TestLazy(TestCase):
+
+    def setUp(self):
+        self.calls = []
+        self.schema = {
+            'type': dict,
+            'value': {
+                'a': {
+                    'type': int,
+                    'pre_call': lambda x: self.calls.append('a') or int(x),
+                },
+                'b': {
+                    'type': list,
+                    'value': {
+                        'type': int,
+                        'pre_call': lambda x: self.calls.append('b') or x,
+                    },
+                },
+                'c': {
+                    'type': str,
+                    'default': 'c',
+                },
+            },
+        }
+
+    def test_access(self):
+        obj = validate_lazy({'a': '1', 'b': [1, 2, 3]}, self.schema)
+        self.assertEqual(self.calls, [])
+        self.assertEqual(obj['a'], 1)
+        self.assertEqual(obj['a'], 1)
+        self.assertEqual(self.calls, ['a'])
+        self.assertEqual(obj['b'][-1], 3)
+        self.assertEqual(self.calls, ['a', 'b'])
+        self.assertEqual(obj['c'], 'c')
+        self.assertEqual(len(obj), 3)
+        with self.assertRaises(KeyError):
+            obj['d']
+
+    def test_contains(self):
+        obj = validate_lazy({'a': 'x', 'b': [1, 'x']}, self.schema)
+        self.assertIn('a', obj)
+        self.assertIn('c', obj)
+        self.assertNotIn('d', obj)
+        self.assertEqual(obj.get('d', 1), 1)
+        self.assertEqual(self.calls, [])
+
+    def test_force(self):
+        obj = validate_lazy({'a': '1', 'b': [1, 2, 3]}, self.schema)
+        self.assertEqual(obj.force(), {'a': 1, 'b': [1, 2, 3], 'c': 'c'})
+        self.assertEqual(self.calls, ['a', 'b', 'b', 'b'])
+
+    def test_keys_checked_upfront(self):
+        with self.assertRaises(ValueError):
+            validate_lazy({'b': []}, self.schema)
+        with self.assertRaises(ValueError):
+            validate_lazy({'a': '1', 'b': [], 'd': 1}, self.schema)
+
+    def test_value_error_on_access(self):
+        obj = validate_lazy({'a': '1', 'b': [1, '2']}, self.schema)
+        self.assertEqual(obj['b'][0], 1)
+        with self.assertRaises(ValueError):
+            obj['b'][1]
+        with self.assertRaises(ValueError):
+            obj.force()
+
+    def test_any_key_tuple(self):
+        schema = {
+            'type': dict,
+            'any_key': {
+                'type': tuple,
+                'value': int,
+            },
+            'errmsg': 'bad value',
+        }
+        obj = validate_lazy({'x': (1, 2), 'y': (1, '2')}, schema)
+        self.assertEqual(obj['x'][:], (1, 2))
+        with self.assertRaises(ValueError) as ctx:
+            obj['y'].force()
+        self.assertEqual(str(ctx.exception), 'bad value')
+
+    def test_eq(self):
+        obj = validate_lazy({'a': '1', 'b': [1, 2]}, self.schema)
+        self.assertEqual(obj['b'], [1, 2])
+        self.assertNotEqual(obj['b'], [1])
+        self.assertEqual(obj, {'a': 1, 'b': [1, 2], 'c': 'c'})
+        self.assertEqual(obj, validate_lazy({'a': '1', 'b': [1, 2]}, self.schema))
+        schema = {'type': tuple, 'value': {'type': int, 'pre_call': int}}
+        self.assertEqual(validate_lazy(('1', '2'), schema), (1, 2))
+        self.assertNotEqual(validate_lazy(('1', '2'), schema), [1, 2])
+
+    def test_eager(self):
+        self.assertEqual(validate_lazy('1', {'type': int, 'pre_call': int}), 1)
+        self.assertEqual(validate_lazy([1], {'type': list, 'value': int, 'post_call': tuple}), (1,))
@@ -0,0 +1,109 @@
+from unittest import TestCase
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+from schema_checker import SchemaRegistry
+
+
+def positive(x):
+    return x > 0
+
+
+def money():
+    return {
+        'type': dict,
+        'value': {
+            'amount': {'type': int, 'filter': positive},
+            'currency': {'type': str, 'default': 'USD'},
+        },
+    }
+
+
+class TestRegistry(TestCase):
+
+    def test_shared_nodes(self):
+        registry = SchemaRegistry()
+        order = registry.register('order', {'type': dict, 'value': {'price': money(), 'total': money()}})
+        refund = registry.register('refund', {'type': dict, 'value': {'amount': money()}})
+        self.assertIs(order['value']['price'], order['value']['total'])
+        self.assertIs(order['value']['price'], refund['value']['amount'])
+        self.assertEqual(len(registry), 2)
+        # order, refund, money, amount and currency
+        self.assertEqual(registry.nodes_count, 5)
+        self.assertIs(registry['order'], order)
+        self.assertIn('refund', registry)
+
+    def test_different_nodes(self):
+        registry = SchemaRegistry()
+        base = registry.prepare(money())
+        cases = [
+            {'type': int, 'filter': lambda x: x > 0},
+            {'type': int, 'filter': positive, 'default': 1},
+            {'type': int, 'filter': positive, 'default': True},
+        ]
+        for amount in cases:
+            schema = money()
+            schema['value']['amount'] = amount
+            self.assertIsNot(registry.prepare(schema), base)
+        schema = money()
+        schema['value'] = dict(reversed(list(schema['value'].items())))
+        self.assertIsNot(registry.prepare(schema), base)
+        self.assertIs(registry.prepare(money()), base)
+
+    def test_validate(self):
+        registry = SchemaRegistry()
+        source = {'type': list, 'value': money()}
+        registry.register('prices', source)
+        self.assertEqual(registry.validate([{'amount': 1}], 'prices'), [{'amount': 1, 'currency': 'USD'}])
+        with self.assertRaises(ValueError):
+            registry.validate([{'amount': -1}], 'prices')
+        with self.assertRaises(ValueError):
+            registry.validate([{'amount': 1}] * 3, 'prices', max_items=2)
+        # source schema is not changed
+        self.assertEqual(source, {'type': list, 'value': money()})
+
+    def test_unhashable_values(self):
+        registry = SchemaRegistry()
+        first = registry.prepare({'type': 'enum', 'value': ['a', 'b']})
+        self.assertIs(registry.prepare({'type': 'enum', 'value': ['a', 'b']}), first)
+        self.assertIsNot(registry.prepare({'type': 'enum', 'value': ['b', 'a']}), first)
+
+    def test_mutable_defaults(self):
+        registry = SchemaRegistry()
+        first = registry.register('first', {'type': dict, 'value': {'a': {'type': list, 'default': []}}})
+        second = registry.register('second', {'type': dict, 'value': {'a': {'type': list, 'default': []}}})
+        self.assertIsNot(first, second)
+        self.assertIsNot(registry.validate({}, 'first')['a'], registry.validate({}, 'second')['a'])
+        default = ([],)
+        first = registry.prepare({'type': tuple, 'default': default})
+        self.assertIs(registry.prepare({'type': tuple, 'default': default}), first)
+        self.assertIsNot(registry.prepare({'type': tuple, 'default': ([],)}), first)
+        const = {'type': 'const', 'value': []}
+        self.assertIsNot(registry.prepare({'type': 'const', 'value': []}), registry.prepare(const))
+        # immutable defaults are still shared
+        first = registry.prepare({'type': tuple, 'default': (1, 'a')})
+        self.assertIs(registry.prepare({'type': tuple, 'default': (1, 'a')}), first)
+
+    def test_equal_but_different_defaults(self):
+        registry = SchemaRegistry()
+        cases = [
+            (
+                datetime(2020, 1, 1, 3, tzinfo=timezone(timedelta(hours=3))),
+                datetime(2020, 1, 1, 0, tzinfo=timezone.utc),
+            ),
+            (Decimal('1.0'), Decimal('1.00')),
+            (0.0, -0.0),
+            ((Decimal('1.0'),), (Decimal('1.00'),)),
+        ]
+        for first, second in cases:
+            self.assertEqual(first, second)
+            for name, value in [('first', first), ('second', second)]:
+                registry.register(name, {'type': dict, 'value': {'a': {'type': object, 'default': value}}})
+            self.assertEqual(repr(registry.validate({}, 'first')['a']), repr(first))
+            self.assertEqual(repr(registry.validate({}, 'second')['a']), repr(second))
+
+    def test_recursive(self):
+        schema = {'type': list}
+        schema['value'] = schema
+        with self.assertRaises(ValueError):
+            SchemaRegistry().prepare(schema)